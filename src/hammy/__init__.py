@@ -3,6 +3,7 @@ from .__main__ import (
     organize_pics as organize_pics,
     resize_pics as resize_pics,
     resize_animations as resize_animations,
+    resize_image as resize_image,
     upload_image as upload_image,
     format_links as format_links,
     EXTENSIONS as EXTENSIONS
@@ -1,36 +1,52 @@
-from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from json import JSONDecodeError
-from fake_useragent import UserAgent
-from pathlib import Path, PurePosixPath
-from PIL import Image
+from pathlib import Path
 from rich.console import Console
 from rich.logging import RichHandler
-from requests.adapters import HTTPAdapter
-from typing import Type, BinaryIO
-from urllib3.util.retry import Retry
-from urllib.parse import urlparse, urlunparse
+from typing import TYPE_CHECKING, Callable, Type, BinaryIO
 import argparse
+import functools
+import hashlib
 import logging
 import msgspec
-import imagequant
 import io
 import os
-import random
-import requests
 import platformdirs
-import pyperclip
-import shutil
 import sys
-import tomlkit
+import threading
+import time
+
+if TYPE_CHECKING:
+    from PIL import Image
+    import requests
 
 EXTENSIONS = frozenset(['.bmp', '.gif', '.jpg', '.jpeg', '.png', '.webp'])
+BARE_EXTENSIONS = frozenset(ext[1:] for ext in EXTENSIONS)
 PLATFORMDIRS = platformdirs.PlatformDirs(appname='hammy', appauthor=False)
 CONFIG_FOLDER = PLATFORMDIRS.user_config_path
 DEFAULT_CONFIGURATION_PATH = CONFIG_FOLDER / 'hammy_config.toml'
+UPLOAD_CACHE_PATH = CONFIG_FOLDER / 'upload_cache.json'
 DEFAULT_ENCODING = 'utf-8'
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+)
+MAX_FILE_SIZE = 7600000
+UNIQUE_SUFFIX_SIZE = 16
+MAX_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024
+REDUCING_GAP = 2.0
+PALETTE_SAMPLE_FRAMES = 16
+JPEG_QUALITY = 75
+SIZE_MARGIN = 0.95
+PROMPT_LOCK = threading.Lock()
+UPLOAD_CACHE: dict[str, tuple[str, str]] = {}
 logging.basicConfig(
     level=logging.INFO, format='%(message)s', datefmt='[%X]', handlers=[RichHandler()]
 )
+logger = logging.getLogger(__name__)
 
 
 class DefaultConfig(msgspec.Struct, kw_only=True):
@@ -38,6 +54,15 @@ class DefaultConfig(msgspec.Struct, kw_only=True):
     txt_path: Path = CONFIG_FOLDER / 'txt'
 
 
+class UploadedImage(msgspec.Struct):
+    url: str
+    id_encoded: str
+
+
+class UploadResponse(msgspec.Struct):
+    image: UploadedImage
+
+
 def parse_hammy() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog='hammy')
     parser.add_argument('source', nargs='+', help='File, folder or url (recursive)')
@@ -60,7 +85,7 @@ def parse_hammy() -> argparse.ArgumentParser:
     parser.add_argument(
         '--format',
         default='d',
-        choices=['b', 'd', 'h', 'i', 'm', 't', 'u'],
+        choices=sorted(FORMATTERS),
         help='Selects desired link formats',
     )
     parser.add_argument(
@@ -70,6 +95,19 @@ def parse_hammy() -> argparse.ArgumentParser:
         default=False,
         help='Outputs links to a text file',
     )
+    parser.add_argument(
+        '--workers',
+        '-j',
+        type=int,
+        default=MAX_WORKERS,
+        help=f'Number of simultaneous uploads (1-{MAX_WORKERS})',
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        default=False,
+        help='Ignores links saved by previous runs and uploads again',
+    )
     return parser
 
 
@@ -97,25 +135,25 @@ def get_config_path(path: Path | None = None) -> Path:
 def load_config(path: Path | None = None) -> DefaultConfig:
     path = get_config_path(path)
 
-    with open(path, 'r', encoding=DEFAULT_ENCODING) as fp:
+    with open(path, 'rb') as fp:
         data = fp.read()
     return msgspec.toml.decode(data, type=DefaultConfig, dec_hook=decode_hook)
 
 
 def save_config(configuration: DefaultConfig, path: Path | None = None) -> None:
     path = get_config_path(path)
-    data = tomlkit.dumps(msgspec.to_builtins(configuration, enc_hook=encode_hook))
+    data = msgspec.toml.encode(configuration, enc_hook=encode_hook)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(path, 'w', encoding=DEFAULT_ENCODING) as fp:
+    with open(path, 'wb') as fp:
         fp.write(data)
-    logging.info(f'New default config saved in: {DEFAULT_CONFIGURATION_PATH}')
+    logger.info('New default config saved in: %s', path)
 
 
 def load_or_create_config(path: Path | None = None) -> DefaultConfig:
     path = get_config_path(path)
     if path.exists():
-        logging.info(f'Previous config found in: {DEFAULT_CONFIGURATION_PATH}')
+        logger.info('Previous config found in: %s', path)
 
     try:
         return load_config(path)
@@ -127,26 +165,8 @@ def load_or_create_config(path: Path | None = None) -> DefaultConfig:
     return configuration
 
 
-CONFIG = load_or_create_config()
-
-if not CONFIG.api_key:
-    try:
-        CONFIG.api_key = input('Enter api key: ')
-
-        if CONFIG.api_key:
-            save_config(CONFIG)
-        else:
-            raise ValueError('Input field was empty')
-
-    except ValueError as e:
-        logging.error(f'{type(e).__name__}: {e}')
-        logging.shutdown()
-        sys.exit(1)
-
-
 def get_useragent_header() -> dict[str, str]:
-    ua = UserAgent()
-    return {'User-Agent': ua.chrome}
+    return {'User-Agent': USER_AGENT}
 
 
 USER_AGENT_HEADER = get_useragent_header()
@@ -161,32 +181,77 @@ def ensure_directories_exist(config: DefaultConfig) -> None:
                 value.mkdir(parents=True, exist_ok=True)
 
 
-ensure_directories_exist(CONFIG)
+@functools.cache
+def get_config() -> DefaultConfig:
+    config = load_or_create_config()
+
+    if not config.api_key:
+        try:
+            config.api_key = input('Enter api key: ')
+
+            if config.api_key:
+                save_config(config)
+            else:
+                raise ValueError('Input field was empty')
+
+        except ValueError as e:
+            logger.error('%s: %s', type(e).__name__, e)
+            logging.shutdown()
+            sys.exit(1)
+
+    ensure_directories_exist(config)
+    return config
+
 
+def create_retry() -> 'requests.Session':
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    import requests
 
-def create_retry() -> requests.Session:
     retry_strategy = Retry(
         total=2,
+        backoff_factor=0.3,
+        respect_retry_after_header=True,
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=['HEAD', 'GET', 'OPTIONS'],
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS, max_retries=retry_strategy)
     http = requests.Session()
+    http.mount('http://', adapter)
     http.mount('https://', adapter)
     return http
 
 
+@functools.cache
+def get_session() -> 'requests.Session':
+    session = create_retry()
+    session.headers.update(USER_AGENT_HEADER)
+    return session
+
+
 def find_images(arg: Path) -> list[Path]:
     image_files = []
+    stack = [os.fspath(arg)]
 
-    for root, dirs, filenames in os.walk(arg):
-        for filename in filenames:
-            full_path = Path(root) / filename
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                    continue
 
-            if full_path.suffix.lower() in EXTENSIONS:
-                image_files.append(full_path)
+                stem, _, ext = entry.name.rpartition('.')
 
-    return sorted(image_files)
+                if stem and ext.lower() in BARE_EXTENSIONS:
+                    image_files.append(Path(entry.path))
+
+    return image_files
 
 
 def organize_pics(filenames: list[Path | str]) -> list[Path | str]:
@@ -196,164 +261,379 @@ def organize_pics(filenames: list[Path | str]) -> list[Path | str]:
         if isinstance(arg, Path) and arg.is_dir():
             pics.extend(find_images(arg))
         else:
-            ext = os.path.splitext((arg))[1]
+            ext = os.path.splitext(get_basename(os.fspath(arg)))[1]
 
             if ext in EXTENSIONS:
                 pics.append(arg)
 
-    pics.sort()
+    pics.sort(key=os.fspath)
     return pics
 
 
-def check_width(new_width: int, width: int) -> int:
+def check_width(new_width: int, width: int, name: str = '') -> int:
+    prompt = f'Current width: {width}{os.linesep}Enter new width: '
+
+    if name:
+        prompt = f'{name}{os.linesep}{prompt}'
+
     try:
-        new_width = int(input(f'Current width: {width}{os.linesep}Enter new width: '))
+        with PROMPT_LOCK:
+            new_width = int(input(prompt))
 
         if new_width < 1 or new_width >= width:
             raise ValueError
  
     except ValueError:
-        logging.error(
+        logger.error(
             'Invalid input. Enter a valid integer greater than 0 and lower than the current width.'
         )
 
     return new_width
 
 
-def is_animated(img_bytes: BinaryIO) -> bool:
-    with Image.open(img_bytes) as img:
-        return getattr(img, "n_frames", 1) > 1
-
-    
-def get_new_dimensions(width: int, height: int, resize: int | None) -> tuple[int, int]:
+def get_new_dimensions(
+    width: int, height: int, resize: int | None, name: str = ''
+) -> tuple[int, int]:
     new_width = 0
 
     if resize is not None:
         new_width = resize
 
     while new_width < 1 or new_width >= width:
-        new_width = check_width(new_width, width)
+        new_width = check_width(new_width, width, name)
 
     new_height = round(new_width * height / width)
     return new_width, new_height
 
 
+def resize_frame(img: 'Image.Image', size: tuple[int, int]) -> 'Image.Image':
+    from PIL import Image
+
+    return img.resize(size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def quantize_frame(img: 'Image.Image') -> 'Image.Image':
+    import imagequant
+
+    return imagequant.quantize_pil_image(
+        img,
+        dithering_level=1.0,
+        max_colors=256,
+        min_quality=0,
+        max_quality=80
+    )
+
+
+def has_alpha(img: 'Image.Image') -> bool:
+    return img.mode == 'RGBA' and img.getchannel('A').getextrema()[0] < 255
+
+
+def build_palette(frames: list['Image.Image']) -> 'Image.Image':
+    from PIL import Image
+
+    sample = [
+        frame.reduce(2)
+        for frame in frames[:: -(-len(frames) // PALETTE_SAMPLE_FRAMES)]
+    ]
+    width, height = sample[0].size
+    sheet = Image.new('RGB', (width, height * len(sample)))
+
+    for idx, frame in enumerate(sample):
+        sheet.paste(frame, (0, idx * height))
+
+    return quantize_frame(sheet)
+
+
+def remap_frame(img: 'Image.Image', palette: 'Image.Image') -> 'Image.Image':
+    from PIL import Image
+
+    return img.convert('RGB').quantize(
+        palette=palette, dither=Image.Dither.FLOYDSTEINBERG
+    )
+
+
+def resize_pic(
+    img: 'Image.Image',
+    resize_output: BinaryIO,
+    resize: int | None = None,
+    name: str = '',
+) -> BinaryIO:
+    width, height = img.size
+    new_width, new_height = get_new_dimensions(width, height, resize, name)
+    img.draft(
+        'RGB',
+        (round(new_width * REDUCING_GAP), round(new_height * REDUCING_GAP)),
+    )
+
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+
+    img = resize_frame(img, (new_width, new_height))
+    img.save(
+        resize_output,
+        format='JPEG',
+        quality=JPEG_QUALITY,
+        subsampling=2,
+        optimize=False,
+        progressive=False,
+    )
+    resize_output.seek(0)
+    return resize_output
+
+
+def save_animation(
+    frames: list['Image.Image'],
+    output: BinaryIO,
+    ext: str,
+    loop: int,
+    duration: int,
+) -> BinaryIO:
+    frames[0].save(
+        output,
+        format=ext,
+        save_all=True,
+        append_images=frames[1:],
+        loop=loop,
+        duration=duration,
+        disposal=2,
+    )
+
+    return output
+
+
+def resize_animation(
+    img: 'Image.Image',
+    resize_output: BinaryIO,
+    ext: str,
+    resize: int | None = None,
+    name: str = '',
+) -> BinaryIO:
+    width, height = img.size
+    new_width, new_height = get_new_dimensions(width, height, resize, name)
+    duration = img.info.get("duration", 100)
+    loop = img.info.get("loop", 0)
+
+    workers = os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future['Image.Image']] = deque()
+        resized = []
+
+        for frame in range(img.n_frames):
+            if len(pending) >= workers:
+                resized.append(pending.popleft().result())
+
+            img.seek(frame)
+            pending.append(
+                executor.submit(
+                    resize_frame, img.convert('RGBA'), (new_width, new_height)
+                )
+            )
+
+        resized.extend(future.result() for future in pending)
+
+        frames = list(executor.map(quantize_frame, resized))
+        encoded = save_animation(frames, io.BytesIO(), ext, loop, duration)
+
+        if not any(has_alpha(frame) for frame in resized):
+            palette = build_palette(resized)
+            frames = list(
+                executor.map(lambda frame: remap_frame(frame, palette), resized)
+            )
+            shared = save_animation(frames, io.BytesIO(), ext, loop, duration)
+
+            if len(shared.getbuffer()) < len(encoded.getbuffer()):
+                encoded = shared
+
+    resize_output.write(encoded.getbuffer())
+    resize_output.seek(0)
+    return resize_output
+
+
 def resize_pics(
-    img_bytes: BinaryIO, resize_output: BinaryIO, resize: int | None = None
+    img_bytes: BinaryIO,
+    resize_output: BinaryIO,
+    resize: int | None = None,
+    name: str = '',
 ) -> BinaryIO:
+    from PIL import Image
+
     with Image.open(img_bytes) as img:
-        width, height = img.size
-        new_width, new_height = get_new_dimensions(width, height, resize)
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        img.save(resize_output, format='JPEG')
-        resize_output.seek(0)
-        return resize_output
+        return resize_pic(img, resize_output, resize, name)
 
 
 def resize_animations(
-    img_bytes: BinaryIO, resize_output: BinaryIO, ext: str, resize: int | None = None
+    img_bytes: BinaryIO,
+    resize_output: BinaryIO,
+    ext: str,
+    resize: int | None = None,
+    name: str = '',
 ) -> BinaryIO:
+    from PIL import Image
+
     with Image.open(img_bytes) as img:
-        width, height = img.size
-        new_width, new_height = get_new_dimensions(width, height, resize)
-        duration = img.info.get("duration", 100)
-        loop = img.info.get("loop", 0)
+        return resize_animation(img, resize_output, ext, resize, name)
 
-        frames = []
-        for frame in range(img.n_frames):
-            img.seek(frame)
-            original = img.copy()
-            resized = original.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            quantized = imagequant.quantize_pil_image(
-                resized,
-                dithering_level=1.0,
-                max_colors=256,
-                min_quality=0,
-                max_quality=80
-            )
-            frames.append(quantized)
-
-        frames[0].save(
-            resize_output,
-            format=ext,
-            save_all=True,
-            append_images=frames[1:],
-            loop=loop,
-            duration=duration,
-            disposal=2,
-        )
 
-        resize_output.seek(0)
-        return resize_output
+def resize_image(
+    img_bytes: BinaryIO,
+    resize_output: BinaryIO,
+    ext: str,
+    resize: int | None = None,
+    name: str = '',
+) -> BinaryIO:
+    from PIL import Image
+
+    with Image.open(img_bytes) as img:
+        if getattr(img, "n_frames", 1) > 1:
+            return resize_animation(img, resize_output, ext, resize, name)
+
+        return resize_pic(img, resize_output, resize, name)
 
 
 def download_image(url: str, output: BinaryIO) -> BinaryIO:
-    r = requests.get(url, headers=USER_AGENT_HEADER)
-    r.raise_for_status()
-    output.write(r.content)
+    import requests
+
+    with get_session().get(url, stream=True) as r:
+        r.raise_for_status()
+
+        try:
+            total = int(r.headers.get('Content-Length', 0))
+        except ValueError:
+            total = 0
+
+        if total <= MAX_DOWNLOAD_SIZE:
+            total = 0
+            r.raw.decode_content = True
+
+            while chunk := r.raw.read(DOWNLOAD_CHUNK_SIZE):
+                total += len(chunk)
+
+                if total > MAX_DOWNLOAD_SIZE:
+                    break
+
+                output.write(chunk)
+
+        if total > MAX_DOWNLOAD_SIZE:
+            raise requests.exceptions.HTTPError(
+                f'Download is bigger than {MAX_DOWNLOAD_SIZE} bytes', response=r
+            )
+
     output.seek(0)
     return output
 
 
-def make_it_unique(input: BinaryIO, output: BinaryIO) -> BinaryIO:
-    shutil.copyfileobj(input, output)
-    output.write(random.randbytes(16))
-    output.seek(0)
+def make_it_unique(output: BinaryIO) -> BinaryIO:
+    output.seek(0, io.SEEK_END)
+    output.write(os.urandom(UNIQUE_SUFFIX_SIZE))
     return output
 
 
-def get_byte_size(buffer: BinaryIO) -> int:
-    return len(io.BytesIO(buffer.read()).getvalue())
+def encode_upload_body(basename: str, content: bytes) -> tuple[BinaryIO, str]:
+    from urllib3.fields import RequestField
+    from urllib3.filepost import choose_boundary
 
+    boundary = choose_boundary()
+    field = RequestField(name='source', data=content, filename=basename)
+    field.make_multipart(content_type=None)
+    body = io.BytesIO()
+    body.write(f'--{boundary}\r\n{field.render_headers()}'.encode(DEFAULT_ENCODING))
+    body.write(content)
+    make_it_unique(body)
+    body.write(f'\r\n--{boundary}--\r\n'.encode(DEFAULT_ENCODING))
+    body.seek(0)
+    return body, f'multipart/form-data; boundary={boundary}'
 
-def check_img_size(buffer: BinaryIO, ext: str) -> BinaryIO:
-    while get_byte_size(buffer) > 7600000:
-        logging.warning(
-            f'Image size is too big! Current Size: {get_byte_size(buffer)}'
-        )
-        buffer = resize_animations(buffer, io.BytesIO(), ext) if is_animated(buffer) else resize_pics(buffer, io.BytesIO())
+
+def get_digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def get_cache_key(api_key: str, content: bytes) -> str:
+    return f'{get_digest(api_key.encode(DEFAULT_ENCODING))}:{get_digest(content)}'
+
+
+def load_upload_cache(path: Path = UPLOAD_CACHE_PATH) -> dict[str, tuple[str, str]]:
+    try:
+        return msgspec.json.decode(path.read_bytes(), type=dict[str, tuple[str, str]])
+    except (FileNotFoundError, msgspec.DecodeError):
+        return {}
+
+
+def save_upload_cache(
+    cache: dict[str, tuple[str, str]], path: Path = UPLOAD_CACHE_PATH
+) -> None:
+    merged = load_upload_cache(path)
+    merged.update(cache)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(msgspec.json.encode(merged))
+
+
+def get_fitting_width(buffer: BinaryIO, size: int) -> int:
+    from PIL import Image
 
     buffer.seek(0)
-    return buffer
 
+    with Image.open(buffer) as img:
+        width = img.width
 
-def upload_image(image_path: Path | str, resize: int | None = None) -> tuple[str, str]:
-    url = 'https://hamster.is/api/1/upload'
-    headers = {'X-API-Key': CONFIG.api_key}
-    http = create_retry()
-    basename = os.path.basename(os.fspath(image_path))
-    ext = os.path.splitext(image_path)[1][1:]
-    str_path = os.fspath(image_path)
+    buffer.seek(0)
+    ratio = ((MAX_FILE_SIZE - UNIQUE_SUFFIX_SIZE) / size) ** 0.5 * SIZE_MARGIN
+    return max(1, int(width * ratio))
 
-    if is_url(str_path):
-        download = download_image(str_path, io.BytesIO())
 
-        if resize:
-            if is_animated(download):
-                dl_buffer = resize_animations(download, io.BytesIO(), ext, resize)
-            else:
-                dl_buffer = resize_pics(download, io.BytesIO(), resize)
-        else:
-            dl_buffer = download
+def check_img_size(buffer: BinaryIO, ext: str, name: str = '') -> BinaryIO:
+    size = buffer.seek(0, io.SEEK_END)
+
+    while size > MAX_FILE_SIZE - UNIQUE_SUFFIX_SIZE:
+        logger.warning('Image size is too big! Current Size: %d', size)
+        resize = get_fitting_width(buffer, size)
+        buffer = resize_image(buffer, io.BytesIO(), ext, resize, name)
+        size = buffer.seek(0, io.SEEK_END)
+
+    buffer.seek(0)
+    return buffer
 
-        unique = make_it_unique(dl_buffer, io.BytesIO())
 
+def read_image(
+    str_path: str, ext: str, resize: int | None = None, name: str = ''
+) -> bytes:
+    if is_url(str_path):
+        buffer = download_image(str_path, io.BytesIO())
+    elif not resize and os.path.getsize(str_path) <= MAX_FILE_SIZE - UNIQUE_SUFFIX_SIZE:
+        return Path(str_path).read_bytes()
     else:
-        with open(image_path, 'rb') as buffer:
+        buffer = io.BytesIO(Path(str_path).read_bytes())
 
-            if resize:
-                if is_animated(buffer):
-                    processed_buffer = resize_animations(buffer, io.BytesIO(), ext, resize)
-                else:
-                    processed_buffer = resize_pics(buffer, io.BytesIO(), resize)
-            else:
-                processed_buffer = buffer
+    if resize:
+        buffer = resize_image(buffer, io.BytesIO(), ext, resize, name)
+
+    return check_img_size(buffer, ext, name).read()
 
-            unique = make_it_unique(processed_buffer, io.BytesIO())
 
-    final = check_img_size(unique, ext)
-    file = {'source': (basename, final)}
-    response = http.post(url, headers=headers, files=file)
+def get_basename(str_path: str) -> str:
+    if is_url(str_path):
+        return str_path.partition('#')[0].partition('?')[0].rpartition('/')[2] or 'download'
+
+    return os.path.basename(str_path)
+
+
+def upload_image(image_path: Path | str, resize: int | None = None) -> tuple[str, str]:
+    url = 'https://hamster.is/api/1/upload'
+    api_key = get_config().api_key
+    headers = {'X-API-Key': api_key}
+    str_path = os.fspath(image_path)
+    basename = get_basename(str_path)
+    ext = os.path.splitext(basename)[1][1:]
+    content = read_image(str_path, ext, resize, basename)
+    digest = get_cache_key(api_key, content)
+
+    if digest in UPLOAD_CACHE:
+        return UPLOAD_CACHE[digest]
+
+    body, content_type = encode_upload_body(basename, content)
+    headers['Content-Type'] = content_type
+    response = get_session().post(url, headers=headers, data=body)
 
     if not response.ok:
         try:
@@ -362,67 +642,56 @@ def upload_image(image_path: Path | str, resize: int | None = None) -> tuple[str
         except (ValueError, JSONDecodeError):
             error_dict = {'message': response.text.strip() or 'No error message'}
 
-        error_dict['file'] = os.path.basename(image_path)
-        logging.error(error_dict)
+        error_dict['file'] = basename
+        logger.error(error_dict)
         response.raise_for_status()
 
-    link = response.json()['image']['url']
-    image_id = response.json()['image']['id_encoded']
-    return link, image_id
-
-
-def save_txt(path_name: Path, text_string: str) -> None:
-    path_name.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(path_name, 'a', encoding='utf-8') as txt_file:
-        txt_file.write(text_string)
+    image = msgspec.json.decode(response.content, type=UploadResponse).image
+    UPLOAD_CACHE[digest] = image.url, image.id_encoded
+    return image.url, image.id_encoded
 
 
 def get_out() -> Path:
-    date: str = datetime.today().strftime('%Y-%m-%d-%H-%M-%S')
-    path_name = CONFIG.txt_path / f'links-{date}.txt'
+    date: str = time.strftime('%Y-%m-%d-%H-%M-%S')
+    path_name = get_config().txt_path / f'links-{date}.txt'
     return path_name
 
 
-def format_links(link_format: str, link: str, image_id: str) -> str:
-    result = ''
-
-    match link_format:
-        case 'b':
-            result = f'[img]{link}[/img]'
-
-        case 'd':
-            result = link
+def change_url_suffix(url: str, new_suffix: str) -> str:
+    path = url.partition('#')[0].partition('?')[0]
+    tail = url[len(path):]
+    head, slash, name = path.rpartition('/')
+    stem, dot, ext = name.rpartition('.')
 
-        case 'h':
-            result = f'[url=https://hamster.is/image/{image_id}][img]{change_url_suffix(link, ".th")}[/img][/url]'
+    if not dot or not stem:
+        return f'{path}{new_suffix}{tail}'
 
-        case 'i':
-            result = f'[imgnm]{link}[/imgnm]'
+    return f'{head}{slash}{stem}{new_suffix}{dot}{ext}{tail}'
 
-        case 'm':
-            result = f'{change_url_suffix(link, ".md")}'
 
-        case 't':
-            result = f'{change_url_suffix(link, ".th")}'
+FORMATTERS: dict[str, Callable[[str, str], str]] = {
+    'b': lambda link, image_id: f'[img]{link}[/img]',
+    'd': lambda link, image_id: link,
+    'h': lambda link, image_id: f'[url=https://hamster.is/image/{image_id}][img]{change_url_suffix(link, ".th")}[/img][/url]',
+    'i': lambda link, image_id: f'[imgnm]{link}[/imgnm]',
+    'm': lambda link, image_id: change_url_suffix(link, '.md'),
+    't': lambda link, image_id: change_url_suffix(link, '.th'),
+    'u': lambda link, image_id: f'[url=https://hamster.is/image/{image_id}][img]{change_url_suffix(link, ".md")}[/img][/url]',
+}
 
-        case 'u':
-            result = f'[url=https://hamster.is/image/{image_id}][img]{change_url_suffix(link, ".md")}[/img][/url]'
 
-    return result
+def format_links(link_format: str, link: str, image_id: str) -> str:
+    formatter = FORMATTERS.get(link_format)
 
+    if formatter is None:
+        return ''
 
-def change_url_suffix(url: str, new_suffix: str) -> str:
-    parts = urlparse(url)
-    path = PurePosixPath(parts.path)
-    new_path = path.with_suffix(f'{new_suffix}{path.suffix}')
-    new_parts = parts._replace(path=str(new_path))
-    return urlunparse(new_parts)
+    return formatter(link, image_id)
 
 
 def is_url(s: str) -> bool:
-    parsed = urlparse(s)
-    return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
+    scheme, sep, rest = s.partition('://')
+    return bool(sep) and scheme.lower() in ('http', 'https') and rest[:1] not in ('', '/', '?', '#')
 
 
 def sort_sources(sources: list[str]) -> list[Path | str]:
@@ -440,44 +709,73 @@ def sort_sources(sources: list[str]) -> list[Path | str]:
 def main() -> None:
     parser = parse_hammy()
     args = parser.parse_args(sys.argv[1:])
+
+    if not 1 <= args.workers <= MAX_WORKERS:
+        parser.error(f'--workers must be between 1 and {MAX_WORKERS}')
+
     resize = args.width
     sorted_sources = sort_sources(args.source)
     pics = organize_pics(sorted_sources)
 
     if not pics:
-        logging.error(f'No compatible arguments.')
+        logger.error('No compatible arguments.')
         logging.shutdown()
         sys.exit(1)
 
-    if args.clip:
-        pyperclip.copy("")
+    import requests
+
+    get_config()
+    get_session()
+
+    if not args.no_cache:
+        UPLOAD_CACHE.update(load_upload_cache())
+
+    console = Console()
+    links: list[str] = []
+    separator = '' if args.single else '\n'
+    txt_file = None
 
     if args.txt:
         output_path = get_out()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        txt_file = open(output_path, 'w', encoding=DEFAULT_ENCODING)
 
-    for idx, pic in enumerate(pics):
-        final_link = ''
+    executor = ThreadPoolExecutor(max_workers=args.workers)
 
-        try:
-            link, image_id = upload_image(pic, resize)
-        except (
-            AttributeError,
-            requests.exceptions.HTTPError,
-        ) as e:
-            logging.error(f'{type(e).__name__}: {e}')
-            continue
+    try:
+        futures = [executor.submit(upload_image, pic, resize) for pic in pics]
+
+        for future in futures:
+            try:
+                link, image_id = future.result()
+            except (
+                AttributeError,
+                OSError,
+                msgspec.DecodeError,
+                requests.exceptions.RequestException,
+            ) as e:
+                logger.error('%s: %s', type(e).__name__, e)
+                continue
+
+            final_link = format_links(args.format, link, image_id)
+            console.print(final_link, markup=False)
+
+            if txt_file is not None:
+                txt_file.write(f'{separator}{final_link}' if links else final_link)
+
+            links.append(final_link)
+    finally:
+        executor.shutdown(cancel_futures=True)
 
-        final_link = format_links(args.format, link, image_id)
-        Console().print(final_link, markup=False)
+        if txt_file is not None:
+            txt_file.close()
 
-        if idx < len(pics) - 1 and not args.single:
-            final_link = final_link + '\n'
+        save_upload_cache(UPLOAD_CACHE)
 
         if args.clip:
-            pyperclip.copy(pyperclip.paste() + final_link)
+            import pyperclip
 
-        if args.txt:
-            save_txt(output_path, final_link)
+            pyperclip.copy(separator.join(links))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -2,19 +2,43 @@ import argparse
 import msgspec
 import requests
 from _typeshed import Incomplete as Incomplete
+from PIL import Image
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, Callable
 
 EXTENSIONS: Incomplete
+BARE_EXTENSIONS: Incomplete
 PLATFORMDIRS: Incomplete
 CONFIG_FOLDER: Incomplete
 DEFAULT_CONFIGURATION_PATH: Incomplete
+UPLOAD_CACHE_PATH: Incomplete
 DEFAULT_ENCODING: str
+USER_AGENT: str
+MAX_FILE_SIZE: int
+UNIQUE_SUFFIX_SIZE: int
+MAX_WORKERS: int
+DOWNLOAD_CHUNK_SIZE: int
+MAX_DOWNLOAD_SIZE: int
+REDUCING_GAP: float
+PALETTE_SAMPLE_FRAMES: int
+JPEG_QUALITY: int
+SIZE_MARGIN: float
+PROMPT_LOCK: Incomplete
+UPLOAD_CACHE: dict[str, tuple[str, str]]
+
+logger: Incomplete
 
 class DefaultConfig(msgspec.Struct, kw_only=True):
     api_key: str = ...
     txt_path: Path = ...
 
+class UploadedImage(msgspec.Struct):
+    url: str
+    id_encoded: str
+
+class UploadResponse(msgspec.Struct):
+    image: UploadedImage
+
 def parse_hammy() -> argparse.ArgumentParser: ...
 def encode_hook(obj: Path | str) -> str: ...
 def decode_hook(type_: type[Path], value: Path | str) -> Path | str: ...
@@ -23,26 +47,47 @@ def load_config(path: Path | None = None) -> DefaultConfig: ...
 def save_config(configuration: DefaultConfig, path: Path | None = None) -> None: ...
 def load_or_create_config(path: Path | None = None) -> DefaultConfig: ...
 
-CONFIG: Incomplete
-
-def get_useragent_header() -> None: ...
+def get_useragent_header() -> dict[str, str]: ...
 
 USER_AGENT_HEADER: Incomplete
 
 def ensure_directories_exist(config: DefaultConfig) -> None: ...
+def get_config() -> DefaultConfig: ...
 def create_retry() -> requests.Session: ...
+def get_session() -> requests.Session: ...
 def find_images(arg: Path) -> list[Path]: ...
 def organize_pics(filenames: list[str]) -> list[Path | str]: ...
-def check_width(new_width: int, width: int) -> int: ...
-def resize_pics(img_bytes: BinaryIO, resize_output: BinaryIO, resize: int | None = None) -> BinaryIO: ...
+def check_width(new_width: int, width: int, name: str = '') -> int: ...
+def get_new_dimensions(width: int, height: int, resize: int | None, name: str = '') -> tuple[int, int]: ...
+def resize_frame(img: Image.Image, size: tuple[int, int]) -> Image.Image: ...
+def quantize_frame(img: Image.Image) -> Image.Image: ...
+def has_alpha(img: Image.Image) -> bool: ...
+def build_palette(frames: list[Image.Image]) -> Image.Image: ...
+def remap_frame(img: Image.Image, palette: Image.Image) -> Image.Image: ...
+def resize_pic(img: Image.Image, resize_output: BinaryIO, resize: int | None = None, name: str = '') -> BinaryIO: ...
+def save_animation(frames: list[Image.Image], output: BinaryIO, ext: str, loop: int, duration: int) -> BinaryIO: ...
+def resize_animation(img: Image.Image, resize_output: BinaryIO, ext: str, resize: int | None = None, name: str = '') -> BinaryIO: ...
+def resize_pics(img_bytes: BinaryIO, resize_output: BinaryIO, resize: int | None = None, name: str = '') -> BinaryIO: ...
+def resize_animations(img_bytes: BinaryIO, resize_output: BinaryIO, ext: str, resize: int | None = None, name: str = '') -> BinaryIO: ...
+def resize_image(img_bytes: BinaryIO, resize_output: BinaryIO, ext: str, resize: int | None = None, name: str = '') -> BinaryIO: ...
 def download_image(url: str, output: BinaryIO) -> BinaryIO: ...
-def make_it_unique(input: BinaryIO, output: BinaryIO) -> BinaryIO: ...
-def check_img_size(buffer: BinaryIO) -> BinaryIO: ...
+def make_it_unique(output: BinaryIO) -> BinaryIO: ...
+def encode_upload_body(basename: str, content: bytes) -> tuple[BinaryIO, str]: ...
+def get_digest(content: bytes) -> str: ...
+def get_cache_key(api_key: str, content: bytes) -> str: ...
+def load_upload_cache(path: Path = ...) -> dict[str, tuple[str, str]]: ...
+def save_upload_cache(cache: dict[str, tuple[str, str]], path: Path = ...) -> None: ...
+def get_fitting_width(buffer: BinaryIO, size: int) -> int: ...
+def check_img_size(buffer: BinaryIO, ext: str, name: str = '') -> BinaryIO: ...
+def read_image(str_path: str, ext: str, resize: int | None = None, name: str = '') -> bytes: ...
+def get_basename(str_path: str) -> str: ...
 def upload_image(image_path: Path | str, resize: int | None = None) -> tuple[str, str]: ...
-def save_txt(path_name: Path, text_string: str) -> None: ...
 def get_out() -> Path: ...
-def format_links(link_format: str, link: str, image_id: str) -> str: ...
 def change_url_suffix(url: str, new_suffix: str) -> str: ...
+
+FORMATTERS: dict[str, Callable[[str, str], str]]
+
+def format_links(link_format: str, link: str, image_id: str) -> str: ...
 def is_url(s: str) -> bool: ...
 def sort_sources(sources: list[str]) -> list[Path | str]: ...
 def main() -> None: ...